@@ -8,8 +8,6 @@ It handles data loading, metric calculation, visualization, and output generatio
 
 import os
 import sys
-from tabulate import tabulate
-import pandas as pd
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
@@ -19,35 +17,32 @@ if sys.platform == 'win32':
     except:
         pass
 
-# Import our custom modules
-from portfolio_analyzer.data_loader import download_stock_data
-from portfolio_analyzer.metrics import calculate_returns, calculate_asset_metrics
-from portfolio_analyzer.portfolio import calculate_portfolio_returns, calculate_portfolio_metrics
-from portfolio_analyzer.visualization import create_visualizations
+# Import our custom modules. Only the lightweight CLI module is imported here;
+# modules that pull in pandas, yfinance or matplotlib are imported where they
+# are used so --help and argument errors return immediately.
 from portfolio_analyzer.cli import parse_arguments, print_configuration
 
 
-def save_results_to_csv(individual_metrics, portfolio_metrics, output_dir="outputs"):
+def save_results(asset_metrics, portfolio_metrics, output_dir="outputs", file_format="csv"):
     """
-    Save analysis results to a CSV file.
+    Save analysis results to a summary file.
     
     Creates a summary table with one row per asset plus one portfolio summary row.
+    The table is written as CSV by default, or as a zstd-compressed Parquet file
+    (requires pyarrow or fastparquet).
     
     Args:
-        individual_metrics: List of dictionaries with individual asset metrics
+        asset_metrics: DataFrame with individual asset metrics (index = tickers),
+                       as returned by calculate_all_asset_metrics
         portfolio_metrics: Dictionary with portfolio metrics
-        output_dir: Directory to save CSV file
+        output_dir: Directory to save the summary file
+        file_format: Either 'csv' or 'parquet' (default: 'csv')
     """
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Create summary data list
-    summary_data = []
+    import pandas as pd
     
-    # Add individual asset metrics
-    for metrics in individual_metrics:
-        summary_data.append(metrics)
+    os.makedirs(output_dir, exist_ok=True)
     
-    # Add portfolio summary row
+    # Portfolio summary row, labeled like the asset metric columns
     portfolio_row = {
         'Ticker': 'PORTFOLIO',
         'Cumulative Return (%)': portfolio_metrics['Portfolio Cumulative Return (%)'],
@@ -55,18 +50,23 @@ def save_results_to_csv(individual_metrics, portfolio_metrics, output_dir="outpu
         'Annualized Volatility (%)': portfolio_metrics['Portfolio Annualized Volatility (%)'],
         'Sharpe Ratio': portfolio_metrics['Portfolio Sharpe Ratio'],
         'Maximum Drawdown (%)': portfolio_metrics['Portfolio Maximum Drawdown (%)'],
-        'Trading Days': individual_metrics[0]['Trading Days'] if individual_metrics else 0
+        'Trading Days': asset_metrics['Trading Days'].iloc[0] if len(asset_metrics) else 0
     }
-    summary_data.append(portfolio_row)
     
-    # Convert to DataFrame and save
-    df_summary = pd.DataFrame(summary_data)
-    csv_path = os.path.join(output_dir, 'portfolio_summary.csv')
-    df_summary.to_csv(csv_path, index=False)
-    print(f"💾 Summary saved to: {csv_path}")
+    # Append the portfolio row to the per-asset table and save
+    df_summary = pd.concat(
+        [asset_metrics.reset_index(), pd.DataFrame([portfolio_row])],
+        ignore_index=True
+    )
+    summary_path = os.path.join(output_dir, f'portfolio_summary.{file_format}')
+    if file_format == 'parquet':
+        df_summary.to_parquet(summary_path, index=False, compression='zstd')
+    else:
+        df_summary.to_csv(summary_path, index=False, float_format='%.4f', lineterminator='\n')
+    print(f"💾 Summary saved to: {summary_path}")
 
 
-def print_results_table(individual_metrics, portfolio_metrics):
+def print_results_table(asset_metrics, portfolio_metrics):
     """
     Print formatted results table to console.
     
@@ -74,37 +74,41 @@ def print_results_table(individual_metrics, portfolio_metrics):
     readable table format.
     
     Args:
-        individual_metrics: List of dictionaries with individual asset metrics
+        asset_metrics: DataFrame with individual asset metrics (index = tickers),
+                       as returned by calculate_all_asset_metrics
         portfolio_metrics: Dictionary with portfolio metrics
     """
+    from tabulate import tabulate
+    
     print("\n" + "="*80)
     print("📈 PORTFOLIO ANALYSIS RESULTS")
     print("="*80)
     
     # Individual asset metrics table
-    if individual_metrics:
+    if len(asset_metrics):
         print("\n📊 Individual Asset Performance:")
         print("-" * 80)
-        table_data = []
-        for metrics in individual_metrics:
-            table_data.append([
-                metrics['Ticker'],
-                f"{metrics['Cumulative Return (%)']:.2f}%",
-                f"{metrics['Annualized Return (%)']:.2f}%",
-                f"{metrics['Annualized Volatility (%)']:.2f}%",
-                f"{metrics['Sharpe Ratio']:.3f}",
-                f"{metrics['Maximum Drawdown (%)']:.2f}%"
-            ])
+        
+        # Pass the numeric columns straight through and let tabulate format
+        # each column once, instead of pre-formatting every cell as a string
+        table_data = asset_metrics[[
+            'Cumulative Return (%)',
+            'Annualized Return (%)',
+            'Annualized Volatility (%)',
+            'Sharpe Ratio',
+            'Maximum Drawdown (%)'
+        ]]
         
         headers = [
             'Ticker', 
-            'Cumulative Return', 
-            'Annualized Return', 
-            'Annualized Volatility', 
+            'Cumulative Return (%)', 
+            'Annualized Return (%)', 
+            'Annualized Volatility (%)', 
             'Sharpe Ratio',
-            'Max Drawdown'
+            'Max Drawdown (%)'
         ]
-        print(tabulate(table_data, headers=headers, tablefmt='grid'))
+        floatfmt = ('', '.2f', '.2f', '.2f', '.3f', '.2f')
+        print(tabulate(table_data, headers=headers, tablefmt='grid', floatfmt=floatfmt))
     
     # Portfolio metrics
     print("\n🎯 Portfolio Summary:")
@@ -135,7 +139,7 @@ def main():
     4. Calculate individual asset metrics
     5. Calculate portfolio metrics
     6. Print results to console
-    7. Save results to CSV
+    7. Save results to CSV (or Parquet)
     8. Generate visualizations
     """
     try:
@@ -145,27 +149,29 @@ def main():
         # Print configuration
         print_configuration(args)
         
+        # Arguments are valid, so load the analysis modules now
+        from portfolio_analyzer.data_loader import download_stock_data
+        from portfolio_analyzer.metrics import calculate_returns, calculate_all_asset_metrics
+        from portfolio_analyzer.portfolio import calculate_portfolio_returns, calculate_portfolio_metrics
+        from portfolio_analyzer.visualization import create_visualizations
+        
         # Step 1: Download stock data
         prices = download_stock_data(
             tickers=args.tickers,
             start_date=args.start_date,
             end_date=args.end_date,
-            period=args.period
+            period=args.period,
+            use_cache=not args.no_cache
         )
         
         # Step 2: Calculate daily returns
         returns = calculate_returns(prices)
         
-        # Step 3: Calculate individual asset metrics
-        individual_metrics = []
-        for ticker in prices.columns:
-            metrics = calculate_asset_metrics(
-                returns[ticker], 
-                ticker, 
-                risk_free_rate=args.risk_free_rate
-            )
-            if metrics:
-                individual_metrics.append(metrics)
+        # Step 3: Calculate individual asset metrics (all assets in one pass)
+        asset_metrics = calculate_all_asset_metrics(
+            returns, 
+            risk_free_rate=args.risk_free_rate
+        )
         
         # Step 4: Calculate portfolio metrics
         portfolio_returns = calculate_portfolio_returns(returns, args.weights)
@@ -176,17 +182,18 @@ def main():
         )
         
         # Step 5: Print results to console
-        print_results_table(individual_metrics, portfolio_metrics)
+        print_results_table(asset_metrics, portfolio_metrics)
         
-        # Step 6: Save results to CSV
-        save_results_to_csv(individual_metrics, portfolio_metrics, args.output_dir)
+        # Step 6: Save results to CSV (or Parquet)
+        save_results(asset_metrics, portfolio_metrics, args.output_dir, args.summary_format)
         
         # Step 7: Create visualizations
         create_visualizations(
             prices, 
             returns, 
             portfolio_returns, 
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            output_format=args.chart_format
         )
         
         print("\n✅ Analysis complete!")
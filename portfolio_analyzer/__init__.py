@@ -3,22 +3,44 @@ Stock Portfolio Analyzer Package
 
 A professional tool for analyzing stock portfolios with historical data,
 calculating performance metrics, and generating visualizations.
+
+Public functions are imported lazily on first access (PEP 562), so importing
+a lightweight submodule such as portfolio_analyzer.cli does not load pandas,
+yfinance or matplotlib.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Your Name"
 
-from .data_loader import download_stock_data
-from .metrics import calculate_returns, calculate_asset_metrics
-from .portfolio import calculate_portfolio_returns, calculate_portfolio_metrics
-from .visualization import create_visualizations
+# Public name -> submodule that defines it
+_LAZY_EXPORTS = {
+    'download_stock_data': '.data_loader',
+    'calculate_returns': '.metrics',
+    'calculate_asset_metrics': '.metrics',
+    'calculate_all_asset_metrics': '.metrics',
+    'calculate_portfolio_returns': '.portfolio',
+    'calculate_portfolio_metrics': '.portfolio',
+    'create_visualizations': '.visualization',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    """Import a public function from its submodule on first access."""
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        value = getattr(module, name)
+        
+        # Cache on the package so later lookups skip __getattr__
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = [
-    'download_stock_data',
-    'calculate_returns',
-    'calculate_asset_metrics',
-    'calculate_portfolio_returns',
-    'calculate_portfolio_metrics',
-    'create_visualizations',
-]
 
+def __dir__():
+    """Include the lazily imported public functions in dir()."""
+    # Names already cached in globals() by __getattr__ appear only once
+    return sorted(set(globals()) | set(__all__))
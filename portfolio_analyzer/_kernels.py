@@ -0,0 +1,100 @@
+"""
+Compiled Kernels
+
+Single-pass loops for the metrics that pandas and NumPy can only express
+as several full-array passes. Each loop is compiled with numba when it is
+installed; otherwise the compiled name is None and callers fall back to
+their pandas/NumPy implementation.
+"""
+
+import numpy as np
+
+# Numba is optional; without it the pandas implementations are used
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _max_drawdown_loop(growth_factors):
+    """
+    Single-pass maximum drawdown over a 1-D array of daily growth factors.
+    
+    Tracks the running growth of $1 and its running peak in two scalars
+    instead of materializing the cumulative, peak and drawdown arrays.
+    Non-finite growth factors are skipped, like pandas' cumprod skips NaN.
+    
+    Args:
+        growth_factors: 1-D numpy array of (1 + daily return) values
+    
+    Returns:
+        float: Maximum drawdown as a decimal (negative value or zero)
+    """
+    cumulative = 1.0
+    peak = -np.inf
+    max_drawdown = 0.0
+    for i in range(growth_factors.shape[0]):
+        growth = growth_factors[i]
+        if not np.isfinite(growth):
+            continue
+        cumulative *= growth
+        if cumulative > peak:
+            peak = cumulative
+        drawdown = (cumulative - peak) / peak
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+    return max_drawdown
+
+
+def _rolling_std_loop(values, window):
+    """
+    Rolling sample standard deviation of each column in one pass.
+    
+    Keeps a running sum and sum of squares per column, adding the newest
+    value and dropping the one that left the window at each step, so the
+    cost is O(T) per column regardless of the window length. Like pandas'
+    rolling(window).std(), a window containing any NaN or infinity yields
+    NaN; such values never enter the running sums.
+    
+    Args:
+        values: 2-D float64 numpy array of shape (T, K)
+        window: Number of observations per window (at least 2)
+    
+    Returns:
+        numpy.ndarray: Array of shape (T, K); the first window - 1 rows are NaN
+    """
+    num_rows, num_cols = values.shape
+    out = np.full((num_rows, num_cols), np.nan)
+    for j in range(num_cols):
+        total = 0.0
+        total_sq = 0.0
+        bad_count = 0
+        for i in range(num_rows):
+            x = values[i, j]
+            if not np.isfinite(x):
+                bad_count += 1
+            else:
+                total += x
+                total_sq += x * x
+            if i >= window:
+                old = values[i - window, j]
+                if not np.isfinite(old):
+                    bad_count -= 1
+                else:
+                    total -= old
+                    total_sq -= old * old
+            if i >= window - 1 and bad_count == 0:
+                variance = (total_sq - total * total / window) / (window - 1)
+                # Rounding in the running sums can push a flat window below zero
+                if variance < 0.0:
+                    variance = 0.0
+                out[i, j] = np.sqrt(variance)
+    return out
+
+
+if njit is not None:
+    max_drawdown = njit(cache=True)(_max_drawdown_loop)
+    rolling_std = njit(cache=True, nogil=True)(_rolling_std_loop)
+else:
+    max_drawdown = None
+    rolling_std = None
@@ -5,6 +5,7 @@ Handles argument parsing, validation, and user-friendly error messages.
 """
 
 import argparse
+import importlib.util
 import sys
 import os
 from datetime import datetime
@@ -95,6 +96,26 @@ Examples:
         help='Directory to save output files (default: outputs/)'
     )
     
+    parser.add_argument(
+        '--summary-format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='File format for the summary table (default: csv). Parquet requires pyarrow.'
+    )
+    
+    parser.add_argument(
+        '--chart-format',
+        choices=['svg', 'png', 'webp'],
+        default='svg',
+        help='File format for the analysis chart (default: svg)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always download fresh data instead of using the local price cache'
+    )
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -184,6 +205,12 @@ def validate_arguments(args):
     if not args.output_dir or args.output_dir.strip() == '':
         print("❌ ERROR: Output directory cannot be empty")
         sys.exit(1)
+    
+    # Check for the Parquet engine now rather than after the whole analysis
+    if args.summary_format == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        print("❌ ERROR: --summary-format parquet requires pyarrow")
+        print("   Install it with: pip install pyarrow")
+        sys.exit(1)
 
 
 def print_configuration(args):
@@ -3,10 +3,13 @@ Data Loading Module
 
 Handles downloading historical stock data from Yahoo Finance.
 Supports both period-based and date range-based downloads.
+Downloaded prices are cached on disk so repeated runs skip the network.
 """
 
+import os
 import sys
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 import pandas as pd
 import yfinance as yf
 
@@ -17,13 +20,183 @@ if sys.platform == 'win32':
     except:
         pass
 
+# Seconds to wait for the Yahoo Finance batch request before giving up
+DOWNLOAD_TIMEOUT = 30
 
-def download_stock_data(tickers, start_date=None, end_date=None, period="1y"):
+# Directory holding one pickled price series per (ticker, date range) request
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'portfolio_analyzer')
+
+# How long a cached series stays valid if its date range reaches today
+CACHE_EXPIRY = timedelta(hours=12)
+
+# Price series already loaded in this process, keyed like the disk cache
+_PRICE_CACHE = {}
+
+
+def _cache_key(ticker, start_date, end_date, period):
+    """
+    Build the cache key identifying one ticker's download request.
+    
+    Args:
+        ticker: Stock ticker symbol
+        start_date: Optional start date string (format: 'YYYY-MM-DD')
+        end_date: Optional end date string (format: 'YYYY-MM-DD')
+        period: Time period string used when dates are not provided
+    
+    Returns:
+        tuple: (ticker, start_date, end_date, period) with unused fields set to None
+    """
+    if start_date and end_date:
+        return (ticker, start_date, end_date, None)
+    return (ticker, None, None, period)
+
+
+def _cache_path(key):
+    """
+    Get the on-disk cache file for a cache key.
+    
+    Args:
+        key: Tuple returned by _cache_key
+    
+    Returns:
+        str: Path of the pickle file for this key
+    """
+    ticker, start_date, end_date, period = key
+    if period is None:
+        filename = f"{ticker}_{start_date}_{end_date}.pkl"
+    else:
+        filename = f"{ticker}_{period}.pkl"
+    return os.path.join(CACHE_DIR, filename)
+
+
+def _is_open_ended(key):
+    """
+    Check whether a request covers today, so its data can still change.
+    
+    Period-based requests are relative to today. Date ranges are immutable
+    once their end date lies in the past.
+    
+    Args:
+        key: Tuple returned by _cache_key
+    
+    Returns:
+        bool: True if cached data for this key should expire
+    """
+    _, _, end_date, period = key
+    if period is not None:
+        return True
+    return datetime.strptime(end_date, '%Y-%m-%d').date() >= datetime.now().date()
+
+
+def _load_cached(key):
+    """
+    Load a cached closing price series, if one exists and is still fresh.
+    
+    Args:
+        key: Tuple returned by _cache_key
+    
+    Returns:
+        pandas.Series or None: Cached closing prices, or None on a cache miss
+    """
+    if key in _PRICE_CACHE:
+        return _PRICE_CACHE[key]
+    
+    path = _cache_path(key)
+    if not os.path.exists(path):
+        return None
+    
+    # Drop stale entries for requests whose data is still changing
+    age = time.time() - os.path.getmtime(path)
+    if _is_open_ended(key) and age > CACHE_EXPIRY.total_seconds():
+        return None
+    
+    try:
+        series = pd.read_pickle(path)
+    except Exception:
+        # Treat unreadable cache files as a miss; they get overwritten
+        return None
+    
+    _PRICE_CACHE[key] = series
+    return series
+
+
+def _store_cached(key, series):
+    """
+    Save a closing price series to the in-process and on-disk caches.
+    
+    Failing to write the disk cache is not an error; the data is simply
+    downloaded again next time.
+    
+    Args:
+        key: Tuple returned by _cache_key
+        series: Closing prices for one ticker
+    """
+    _PRICE_CACHE[key] = series
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        series.to_pickle(_cache_path(key))
+    except OSError:
+        pass
+
+
+def _download_close_prices(tickers, start_date=None, end_date=None, period="1y"):
+    """
+    Download closing prices for several tickers with one batch request.
+    
+    Args:
+        tickers: List of stock ticker symbols
+        start_date: Optional start date string (format: 'YYYY-MM-DD')
+        end_date: Optional end date string (format: 'YYYY-MM-DD')
+        period: Time period string used when dates are not provided
+    
+    Returns:
+        pandas.DataFrame: One column per requested ticker; tickers that
+                          failed to download are all-NaN columns
+    """
+    download_kwargs = dict(
+        progress=False,
+        auto_adjust=True,
+        group_by='column',
+        timeout=DOWNLOAD_TIMEOUT,
+    )
+    
+    # Use date range if provided, otherwise use period
+    if start_date and end_date:
+        download_kwargs.update(start=start_date, end=end_date)
+    else:
+        download_kwargs.update(period=period)
+    
+    try:
+        hist = yf.download(tickers, **download_kwargs)
+    except Exception as e:
+        print(f"  ❌ Error: {str(e)}")
+        hist = None
+    
+    if hist is None or hist.empty:
+        prices = pd.DataFrame(columns=tickers, dtype=float)
+    else:
+        # Extract closing prices
+        prices = hist['Close']
+    
+    # Older yfinance versions return a Series for a single ticker
+    if isinstance(prices, pd.Series):
+        prices = pd.DataFrame({tickers[0]: prices})
+    
+    # Tickers that failed come back as all-NaN (or missing) columns
+    return prices.reindex(columns=tickers)
+
+
+def download_stock_data(tickers, start_date=None, end_date=None, period="1y",
+                        use_cache=True):
     """
     Download historical stock data for given tickers.
     
     This function downloads closing prices for the specified tickers.
     It can use either a period string (like "1y") or specific start/end dates.
+    All tickers missing from the cache are fetched with a single batch request.
+    
+    Cached prices for a past date range never expire. Prices for a period or
+    for a range ending today are refreshed after CACHE_EXPIRY.
     
     Args:
         tickers: List of stock ticker symbols (e.g., ['AAPL', 'MSFT'])
@@ -31,6 +204,7 @@ def download_stock_data(tickers, start_date=None, end_date=None, period="1y"):
         end_date: Optional end date string (format: 'YYYY-MM-DD')
         period: Time period string if dates not provided (default: "1y")
                 Options: 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
+        use_cache: Whether to read and write the price cache (default: True)
     
     Returns:
         pandas.DataFrame: DataFrame with dates as index and tickers as columns
@@ -41,34 +215,31 @@ def download_stock_data(tickers, start_date=None, end_date=None, period="1y"):
     """
     print(f"\n📥 Downloading data for {len(tickers)} ticker(s)...")
     
+    keys = {ticker: _cache_key(ticker, start_date, end_date, period) for ticker in tickers}
+    
+    # Start with whatever is already cached
     data = {}
-    failed_tickers = []
+    if use_cache:
+        for ticker in tickers:
+            cached = _load_cached(keys[ticker])
+            if cached is not None:
+                data[ticker] = cached
+        if data:
+            print(f"  ♻️  Loaded {len(data)} ticker(s) from cache")
     
-    # Download data for each ticker
-    for ticker in tickers:
-        try:
-            print(f"  Fetching {ticker}...", end=" ")
-            stock = yf.Ticker(ticker)
-            
-            # Use date range if provided, otherwise use period
-            if start_date and end_date:
-                hist = stock.history(start=start_date, end=end_date)
-            else:
-                hist = stock.history(period=period)
-            
-            # Check if we got any data
-            if hist.empty:
-                print(f"❌ No data found")
+    # Download the rest in one request
+    missing = [ticker for ticker in tickers if ticker not in data]
+    failed_tickers = []
+    if missing:
+        downloaded = _download_close_prices(missing, start_date, end_date, period)
+        for ticker in missing:
+            series = downloaded[ticker].dropna()
+            if series.empty:
                 failed_tickers.append(ticker)
                 continue
-            
-            # Extract closing prices
-            data[ticker] = hist['Close']
-            print(f"✅ {len(hist)} days of data")
-            
-        except Exception as e:
-            print(f"❌ Error: {str(e)}")
-            failed_tickers.append(ticker)
+            data[ticker] = series
+            if use_cache:
+                _store_cached(keys[ticker], series)
     
     # Validate that we got at least some data
     if not data:
@@ -79,17 +250,18 @@ def download_stock_data(tickers, start_date=None, end_date=None, period="1y"):
         print("   - Date range is valid (if specified)")
         sys.exit(1)
     
+    # Combine all ticker data into a single DataFrame, keeping ticker order
+    df = pd.DataFrame({ticker: data[ticker] for ticker in tickers if ticker in data})
+    df.index.name = 'Date'
+    
+    print(f"  ✅ {len(df)} days of data for {len(df.columns)} ticker(s)")
+    
     # Warn about failed tickers but continue with successful ones
     if failed_tickers:
         print(f"\n⚠️  Warning: Failed to download data for: {', '.join(failed_tickers)}")
-        print(f"Continuing with {len(data)} ticker(s)...")
-    
-    # Combine all ticker data into a single DataFrame
-    df = pd.DataFrame(data)
-    df.index.name = 'Date'
+        print(f"Continuing with {len(df.columns)} ticker(s)...")
     
     # Sort by date to ensure chronological order
     df = df.sort_index()
     
     return df
-
@@ -12,9 +12,103 @@ Calculates performance metrics for individual assets including:
 import numpy as np
 import pandas as pd
 
+from . import _kernels
+
 # Number of trading days per year (used for annualization)
 TRADING_DAYS_PER_YEAR = 252
 
+# Factor that scales daily volatility to annualized volatility
+_SQRT_TRADING_DAYS = float(np.sqrt(TRADING_DAYS_PER_YEAR))
+
+# Daily returns are stored as float32, which is ample for percentages
+# reported to two decimals and halves the memory every metric reads.
+# Products and variances are still accumulated in float64.
+RETURNS_DTYPE = np.float32
+
+
+# The helpers below work on a contiguous float ndarray of daily returns
+# (or of daily growth factors, 1 + return) so calculate_asset_metrics
+# converts from pandas and adds 1 only once per asset.
+
+def _as_float_array(values):
+    """Contiguous float ndarray of values, keeping float32 input as float32."""
+    arr = np.asarray(values)
+    dtype = arr.dtype if arr.dtype in (np.float32, np.float64) else np.float64
+    return np.ascontiguousarray(arr, dtype=dtype)
+
+
+def _cumulative_return_from_growth(growth_factors):
+    """Cumulative return as a decimal from an array of (1 + return) values."""
+    return float(np.prod(growth_factors, dtype=np.float64) - 1.0)
+
+
+def _annualized_return_from_cumulative(cumulative_return, trading_days):
+    """Annualize a cumulative return earned over trading_days days."""
+    return (1.0 + cumulative_return) ** (TRADING_DAYS_PER_YEAR / trading_days) - 1.0
+
+
+def _annualized_volatility_array(arr):
+    """Annualized sample standard deviation of a returns array."""
+    if arr.size < 2:
+        return float('nan')
+    return float(arr.std(ddof=1, dtype=np.float64) * _SQRT_TRADING_DAYS)
+
+
+def _maximum_drawdown_from_growth(growth_factors):
+    """Maximum drawdown as a decimal from a non-empty array of (1 + return) values."""
+    # Use the compiled single-pass kernel when numba is installed
+    if _kernels.max_drawdown is not None:
+        return _kernels.max_drawdown(growth_factors)
+    
+    # Skip missing days, as pandas' cumprod does, instead of spreading NaN
+    growth_factors = growth_factors[np.isfinite(growth_factors)]
+    if growth_factors.size == 0:
+        return 0.0
+    
+    # Calculate cumulative returns over time
+    cumulative_returns = np.cumprod(growth_factors, dtype=np.float64)
+    
+    # Calculate running maximum (peak) at each point
+    running_max = np.maximum.accumulate(cumulative_returns)
+    
+    # Drawdown = (current value - peak) / peak
+    drawdown = (cumulative_returns - running_max) / running_max
+    
+    # Maximum drawdown is the most negative value
+    return float(drawdown.min())
+
+
+def _metrics_from_array(arr, risk_free_rate):
+    """
+    Compute every performance metric from a non-empty returns ndarray.
+    
+    Shared by calculate_asset_metrics and the portfolio metrics so both
+    report identical numbers for identical returns.
+    
+    Args:
+        arr: 1-D array from _as_float_array of daily returns
+        risk_free_rate: Risk-free rate for Sharpe ratio
+    
+    Returns:
+        tuple: (cumulative return, annualized return, annualized volatility,
+                Sharpe ratio, maximum drawdown), all floats, returns as decimals
+    """
+    # Daily growth factors, shared by cumulative return and drawdown
+    growth_factors = 1.0 + arr
+    
+    cumulative_return = _cumulative_return_from_growth(growth_factors)
+    annualized_return = _annualized_return_from_cumulative(cumulative_return, arr.size)
+    annualized_vol = _annualized_volatility_array(arr)
+    max_drawdown = _maximum_drawdown_from_growth(growth_factors)
+    
+    # Avoid division by zero, as in calculate_sharpe_ratio
+    if annualized_vol == 0:
+        sharpe_ratio = 0.0
+    else:
+        sharpe_ratio = (annualized_return - risk_free_rate) / annualized_vol
+    
+    return cumulative_return, annualized_return, annualized_vol, sharpe_ratio, max_drawdown
+
 
 def calculate_returns(prices):
     """
@@ -26,13 +120,24 @@ def calculate_returns(prices):
         prices: DataFrame with stock prices (dates as index, tickers as columns)
     
     Returns:
-        pandas.DataFrame: DataFrame with daily returns (first row will be NaN, then dropped)
+        pandas.DataFrame: DataFrame with daily returns as RETURNS_DTYPE
+                          (first row will be NaN, then dropped)
     """
-    # Calculate percentage change day-over-day
-    returns = prices.pct_change()
+    arr = prices.to_numpy(dtype=np.float64)
+    
+    # Calculate percentage change day-over-day directly on the ndarray;
+    # the first day has no previous price, so it is never produced
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = arr[1:] / arr[:-1] - 1
+    index = prices.index[1:]
     
-    # Remove the first row (which is NaN since there's no previous day)
-    returns = returns.dropna()
+    # Remove days where any ticker is missing a price today or yesterday
+    valid = ~np.isnan(values).any(axis=1)
+    if not valid.all():
+        values = values[valid]
+        index = index[valid]
+    
+    returns = pd.DataFrame(values.astype(RETURNS_DTYPE), index=index, columns=prices.columns)
     
     return returns
 
@@ -101,7 +206,7 @@ def calculate_annualized_volatility(returns):
     daily_volatility = returns.std()
     
     # Annualize by multiplying by square root of trading days per year
-    annualized_vol = daily_volatility * np.sqrt(TRADING_DAYS_PER_YEAR)
+    annualized_vol = daily_volatility * _SQRT_TRADING_DAYS
     
     return annualized_vol
 
@@ -150,19 +255,8 @@ def calculate_maximum_drawdown(returns):
     if len(returns) == 0:
         return 0.0
     
-    # Calculate cumulative returns over time
-    cumulative_returns = (1 + returns).cumprod()
-    
-    # Calculate running maximum (peak) at each point
-    running_max = cumulative_returns.expanding().max()
-    
-    # Drawdown = (current value - peak) / peak
-    drawdown = (cumulative_returns - running_max) / running_max
-    
-    # Maximum drawdown is the most negative value
-    max_drawdown = drawdown.min()
-    
-    return max_drawdown
+    arr = _as_float_array(returns)
+    return _maximum_drawdown_from_growth(1.0 + arr)
 
 
 def calculate_rolling_volatility(returns, window=30):
@@ -173,20 +267,29 @@ def calculate_rolling_volatility(returns, window=30):
     understanding periods of high and low risk.
     
     Args:
-        returns: Series of daily returns
+        returns: Series of daily returns, or DataFrame with one column per asset
         window: Number of days for rolling window (default: 30)
     
     Returns:
-        pandas.Series: Rolling annualized volatility
+        pandas.Series or DataFrame: Rolling annualized volatility
     """
     if len(returns) == 0:
         return pd.Series(dtype=float)
     
-    # Calculate rolling standard deviation
-    rolling_std = returns.rolling(window=window).std()
+    # Calculate rolling standard deviation, with the compiled O(T)
+    # running-sum kernel when numba is installed
+    if _kernels.rolling_std is not None and window >= 2:
+        values = returns.to_numpy(dtype=np.float64)
+        std_values = _kernels.rolling_std(values.reshape(len(returns), -1), window)
+        if isinstance(returns, pd.DataFrame):
+            rolling_std = pd.DataFrame(std_values, index=returns.index, columns=returns.columns)
+        else:
+            rolling_std = pd.Series(std_values[:, 0], index=returns.index, name=returns.name)
+    else:
+        rolling_std = returns.rolling(window=window).std()
     
     # Annualize by multiplying by sqrt(252)
-    rolling_vol = rolling_std * np.sqrt(TRADING_DAYS_PER_YEAR)
+    rolling_vol = rolling_std * _SQRT_TRADING_DAYS
     
     return rolling_vol
 
@@ -209,13 +312,13 @@ def calculate_asset_metrics(returns, ticker, risk_free_rate=0.03):
     if len(returns) == 0:
         return None
     
+    # Convert to a contiguous ndarray once and reuse it for every metric
+    arr = _as_float_array(returns.to_numpy())
+    trading_days = arr.size
+    
     # Calculate all metrics
-    cumulative_return = calculate_cumulative_return(returns)
-    annualized_return = calculate_annualized_return(returns)
-    annualized_vol = calculate_annualized_volatility(returns)
-    sharpe_ratio = calculate_sharpe_ratio(returns, risk_free_rate)
-    max_drawdown = calculate_maximum_drawdown(returns)
-    trading_days = len(returns)
+    (cumulative_return, annualized_return, annualized_vol,
+     sharpe_ratio, max_drawdown) = _metrics_from_array(arr, risk_free_rate)
     
     # Return as dictionary with clear labels
     metrics = {
@@ -230,3 +333,66 @@ def calculate_asset_metrics(returns, ticker, risk_free_rate=0.03):
     
     return metrics
 
+
+def calculate_all_asset_metrics(returns, risk_free_rate=0.03):
+    """
+    Calculate all performance metrics for every asset at once.
+    
+    Produces the same numbers as calling calculate_asset_metrics on each
+    column, but computes each metric as one column-wise reduction over the
+    whole returns DataFrame instead of looping over tickers.
+    
+    Args:
+        returns: DataFrame with daily returns (columns = tickers, index = dates)
+        risk_free_rate: Risk-free rate for Sharpe ratio (default: 0.03)
+    
+    Returns:
+        pandas.DataFrame: One row per ticker (index named 'Ticker') with the
+                          same metric columns as calculate_asset_metrics
+    """
+    columns = [
+        'Cumulative Return (%)',
+        'Annualized Return (%)',
+        'Annualized Volatility (%)',
+        'Sharpe Ratio',
+        'Maximum Drawdown (%)',
+        'Trading Days'
+    ]
+    
+    trading_days = len(returns)
+    if trading_days == 0:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name='Ticker'))
+    
+    values = _as_float_array(returns.to_numpy())
+    
+    # Growth of $1 over time for each asset
+    growth = np.cumprod(1.0 + values, axis=0, dtype=np.float64)
+    
+    cumulative_return = pd.Series(growth[-1] - 1, index=returns.columns)
+    annualized_return = (1 + cumulative_return) ** (TRADING_DAYS_PER_YEAR / trading_days) - 1
+    
+    # Sample standard deviation is undefined for a single day
+    if trading_days < 2:
+        daily_volatility = np.full(values.shape[1], np.nan)
+    else:
+        daily_volatility = values.std(axis=0, ddof=1, dtype=np.float64)
+    annualized_vol = pd.Series(daily_volatility * _SQRT_TRADING_DAYS, index=returns.columns)
+    
+    # Sharpe ratio is defined as 0 for assets with zero volatility
+    sharpe_ratio = ((annualized_return - risk_free_rate) / annualized_vol).where(annualized_vol != 0, 0.0)
+    
+    # Drawdown from the running peak, worst value per asset
+    drawdown = growth / np.maximum.accumulate(growth, axis=0) - 1
+    max_drawdown = pd.Series(drawdown.min(axis=0), index=returns.columns)
+    
+    metrics = pd.DataFrame({
+        'Cumulative Return (%)': cumulative_return * 100,
+        'Annualized Return (%)': annualized_return * 100,
+        'Annualized Volatility (%)': annualized_vol * 100,
+        'Sharpe Ratio': sharpe_ratio,
+        'Maximum Drawdown (%)': max_drawdown * 100,
+        'Trading Days': trading_days
+    }, columns=columns)
+    metrics.index.name = 'Ticker'
+    
+    return metrics
@@ -7,29 +7,27 @@ Handles portfolio-level calculations including:
 - Weight validation and normalization
 """
 
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 from .metrics import (
-    calculate_cumulative_return,
-    calculate_annualized_return,
-    calculate_annualized_volatility,
-    calculate_sharpe_ratio,
-    calculate_maximum_drawdown,
-    TRADING_DAYS_PER_YEAR
+    TRADING_DAYS_PER_YEAR,
+    _as_float_array,
+    _metrics_from_array
 )
 
 
-def validate_weights(weights, num_tickers):
+@lru_cache(maxsize=32)
+def _validate_weights_cached(weights, num_tickers):
     """
-    Validate that weights are correct.
+    Validate and normalize a hashable tuple of weights.
     
-    Checks:
-    - Number of weights matches number of tickers
-    - All weights are non-negative
-    - Sum of weights is not zero
+    Cached so that repeated validation of the same weights (e.g. once for
+    portfolio returns and once for portfolio metrics) is computed only once.
+    The returned array is shared between calls and must not be modified.
     
     Args:
-        weights: List of weights (can be None)
+        weights: Tuple of weights (can be None)
         num_tickers: Number of tickers in portfolio
     
     Returns:
@@ -40,9 +38,9 @@ def validate_weights(weights, num_tickers):
     """
     if weights is None:
         # Equal weights if not specified
-        return np.array([1.0 / num_tickers] * num_tickers)
+        return np.full(num_tickers, 1.0 / num_tickers)
     
-    weights = np.array(weights)
+    weights = np.asarray(weights, dtype=np.float64)
     
     # Check number of weights matches number of tickers
     if len(weights) != num_tickers:
@@ -51,19 +49,66 @@ def validate_weights(weights, num_tickers):
         )
     
     # Check for negative weights
-    if any(w < 0 for w in weights):
+    if (weights < 0).any():
         raise ValueError("Weights cannot be negative")
     
     # Check sum is not zero
-    if np.sum(weights) == 0:
+    total = weights.sum()
+    if total == 0:
         raise ValueError("Sum of weights cannot be zero")
     
     # Normalize weights to sum to 1
-    normalized_weights = weights / np.sum(weights)
+    normalized_weights = weights / total
     
     return normalized_weights
 
 
+def validate_weights(weights, num_tickers):
+    """
+    Validate that weights are correct.
+    
+    Checks:
+    - Number of weights matches number of tickers
+    - All weights are non-negative
+    - Sum of weights is not zero
+    
+    Args:
+        weights: List of weights (can be None)
+        num_tickers: Number of tickers in portfolio
+    
+    Returns:
+        numpy.ndarray: Normalized weights that sum to 1
+    
+    Raises:
+        ValueError: If validation fails
+    """
+    weights_key = None if weights is None else tuple(weights)
+    
+    # Return a copy so callers cannot modify the cached array
+    return _validate_weights_cached(weights_key, num_tickers).copy()
+
+
+def _weighted_returns(returns, normalized_weights):
+    """
+    Combine asset returns into portfolio returns using validated weights.
+    
+    Args:
+        returns: DataFrame with daily returns (columns = tickers, index = dates),
+                 without missing values (as produced by calculate_returns)
+        normalized_weights: numpy.ndarray of weights already passed through
+                            validate_weights
+    
+    Returns:
+        pandas.Series: Daily returns of the portfolio
+    """
+    # A single matrix-vector product (BLAS gemv) weights and sums across
+    # assets without materializing a days x assets temporary; weights are
+    # cast to the returns dtype so float32 returns stay float32
+    values = _as_float_array(returns.to_numpy())
+    weights = normalized_weights.astype(values.dtype, copy=False)
+    return pd.Series(values @ weights, index=returns.index)
+
+
 def calculate_portfolio_returns(returns, weights=None):
     """
     Calculate portfolio daily returns from individual asset returns.
@@ -86,8 +131,7 @@ def calculate_portfolio_returns(returns, weights=None):
     normalized_weights = validate_weights(weights, num_tickers)
     
     # Calculate weighted average of returns
-    # Multiply each asset's returns by its weight, then sum across assets
-    portfolio_returns = (returns * normalized_weights).sum(axis=1)
+    portfolio_returns = _weighted_returns(returns, normalized_weights)
     
     return portfolio_returns
 
@@ -107,22 +151,27 @@ def calculate_portfolio_metrics(returns, weights=None, risk_free_rate=0.03):
     Returns:
         dict: Dictionary containing portfolio metrics and weights
     """
-    # Calculate portfolio daily returns
-    portfolio_returns = calculate_portfolio_returns(returns, weights)
-    
-    # Get normalized weights for output
-    num_tickers = len(returns.columns)
+    # Look up columns and validate weights once, reusing them below
+    cols = returns.columns
+    num_tickers = len(cols)
     normalized_weights = validate_weights(weights, num_tickers)
     
-    # Calculate portfolio metrics (same as individual asset metrics)
-    cumulative_return = calculate_cumulative_return(portfolio_returns)
-    annualized_return = calculate_annualized_return(portfolio_returns)
-    annualized_vol = calculate_annualized_volatility(portfolio_returns)
-    sharpe_ratio = calculate_sharpe_ratio(portfolio_returns, risk_free_rate)
-    max_drawdown = calculate_maximum_drawdown(portfolio_returns)
+    # Calculate portfolio daily returns
+    portfolio_returns = _weighted_returns(returns, normalized_weights)
+    
+    # Calculate portfolio metrics with the same float64-accumulating array
+    # helpers as calculate_asset_metrics, so a single-asset portfolio
+    # matches its asset exactly
+    arr = _as_float_array(portfolio_returns.to_numpy())
+    if arr.size == 0:
+        cumulative_return = annualized_return = annualized_vol = 0.0
+        sharpe_ratio = max_drawdown = 0.0
+    else:
+        (cumulative_return, annualized_return, annualized_vol,
+         sharpe_ratio, max_drawdown) = _metrics_from_array(arr, risk_free_rate)
     
     # Create weights dictionary for easy access
-    weights_dict = dict(zip(returns.columns, normalized_weights))
+    weights_dict = dict(zip(cols, normalized_weights))
     
     # Return all metrics
     metrics = {
@@ -7,14 +7,225 @@ Creates charts and visualizations for portfolio analysis including:
 - Rolling volatility
 """
 
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
 import matplotlib.dates as mdates
+import matplotlib.image as mpimg
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+from .metrics import calculate_rolling_volatility
+
+# Background workers for create_visualizations(async_save=True). Threads
+# are only started on first use; image encoding releases the GIL.
+_SAVE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='chart-save')
+
+
+def _plot_line_collection(ax, x, values, colors, labels, linewidth=2, alpha=1.0, linestyle='-'):
+    """
+    Draw one line per column of values as a single LineCollection.
+    
+    A single collection is one artist with one transform pass, instead of
+    one Line2D per asset. Because a collection has no per-line legend
+    entries, matching proxy handles are returned for building the legend.
+    
+    Args:
+        ax: Matplotlib Axes to draw on
+        x: Array of x positions (matplotlib date numbers), either 1-D of
+           length T shared by every line or 2-D of shape (T, K)
+        values: 2-D array of shape (T, K), one column per line
+        colors: List of K colors
+        labels: List of K legend labels
+        linewidth: Line width for every line
+        alpha: Opacity for every line
+        linestyle: Line style for every line
+    
+    Returns:
+        list: Line2D proxy artists to pass to ax.legend(handles=...)
+    """
+    # Segments array of shape (K, T, 2): the (x, y) points of each line
+    x = np.asarray(x)
+    x_lines = np.broadcast_to(x.T if x.ndim == 2 else x, values.T.shape)
+    segments = np.stack([x_lines, values.T], axis=-1)
+    
+    collection = LineCollection(segments, colors=colors, linewidths=linewidth,
+                                linestyles=linestyle, alpha=alpha)
+    ax.add_collection(collection)
+    ax.autoscale_view()
+    
+    return [
+        Line2D([], [], color=color, label=label, linewidth=linewidth,
+               alpha=alpha, linestyle=linestyle)
+        for color, label in zip(colors, labels)
+    ]
+
+
+def _lttb_indices(x, values, num_points):
+    """
+    Pick num_points samples per column with Largest-Triangle-Three-Buckets.
+    
+    The first and last samples are always kept. The samples in between are
+    split into num_points - 2 buckets, and from each bucket LTTB keeps the
+    sample forming the largest triangle with the previously kept sample and
+    the average of the next bucket, which preserves peaks and troughs far
+    better than taking every n-th sample. Buckets are walked in order but
+    every column is handled at once. NaN samples are only kept when their
+    whole bucket is NaN, so gaps such as a rolling warm-up stay gaps.
+    
+    Args:
+        x: 1-D array of x positions, length T
+        values: 2-D array of shape (T, K)
+        num_points: Number of samples to keep per column (at least 3, less than T)
+    
+    Returns:
+        numpy.ndarray: Integer row indices of shape (num_points, K), increasing
+                       down each column
+    """
+    num_rows, num_cols = values.shape
+    
+    # Bucket i covers rows edges[i]:edges[i + 1] of the interior rows
+    edges = np.linspace(1, num_rows - 1, num_points - 1).astype(np.intp)
+    
+    # Average point of every bucket, ignoring NaN (all-NaN buckets stay NaN)
+    interior = values[1:-1]
+    finite = ~np.isnan(interior)
+    starts = edges[:-1] - 1
+    sums = np.add.reduceat(np.where(finite, interior, 0.0), starts, axis=0)
+    counts = np.add.reduceat(finite, starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_y = sums / counts
+    mean_x = np.add.reduceat(x[1:-1], starts) / np.diff(edges)
+    
+    # The bucket after the last one is just the final sample
+    mean_x = np.append(mean_x, x[-1])
+    mean_y = np.vstack([mean_y, values[-1]])
+    
+    indices = np.empty((num_points, num_cols), dtype=np.intp)
+    indices[0] = 0
+    indices[-1] = num_rows - 1
+    columns = np.arange(num_cols)
+    
+    for i in range(num_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        prev_x = x[indices[i]]
+        prev_y = values[indices[i], columns]
+        
+        # Twice the triangle area for every candidate in the bucket, per column
+        candidates = values[start:stop]
+        area = np.abs(
+            (prev_x - mean_x[i + 1]) * (candidates - prev_y)
+            - (prev_x - x[start:stop, None]) * (mean_y[i + 1] - prev_y)
+        )
+        
+        # The area is undefined next to a NaN previous pick or bucket average;
+        # finite candidates must still win over NaN ones there
+        undefined = np.isnan(area)
+        area[undefined] = np.where(np.isnan(candidates[undefined]), -1.0, 0.0)
+        indices[i + 1] = start + area.argmax(axis=0)
+    
+    return indices
+
+
+def _downsample(x, values, max_points):
+    """
+    Reduce each column to at most max_points samples with LTTB.
+    
+    Args:
+        x: 1-D array of x positions, length T
+        values: 2-D array of shape (T, K)
+        max_points: Samples to keep per column (at least 3, both endpoints
+                    and one per bucket), or None to keep everything
+    
+    Returns:
+        tuple: (x, values) unchanged if T <= max_points, otherwise both of
+               shape (max_points, K) with per-column x positions
+    
+    Raises:
+        ValueError: If max_points is less than 3
+    """
+    if max_points is not None and max_points < 3:
+        raise ValueError(f"max_points must be at least 3, got {max_points}")
+    
+    if max_points is None or len(x) <= max_points:
+        return x, values
+    
+    indices = _lttb_indices(x, values, max_points)
+    return x[indices], np.take_along_axis(values, indices, axis=0)
+
+
+def _style_date_axis(ax):
+    """
+    Apply the shared grid and month-based date tick styling to an Axes.
+    
+    Each axis gets its own formatter and locator: matplotlib locators keep a
+    reference to the axis they are attached to, so one shared instance would
+    compute ticks from whichever axis used it last.
+    
+    Args:
+        ax: Matplotlib Axes whose x data are matplotlib date numbers
+    """
+    ax.grid(True, alpha=0.3, linestyle='--')
+    ax.tick_params(axis='x', rotation=45)
+    
+    # Data is plotted as matplotlib date numbers, so mark the axis as dates
+    ax.xaxis_date()
+    
+    # Format x-axis dates nicely
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
+    ax.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
+
+
+def _write_bytes(path, data):
+    """Write already-serialized chart bytes to path and return the path."""
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+def _write_image(path, rgba, output_format, dpi):
+    """Encode a rendered RGBA pixel buffer to path and return the path."""
+    mpimg.imsave(path, rgba, format=output_format, dpi=dpi)
+    return path
+
+
+def _submit_save(fig, chart_path, output_format, dpi):
+    """
+    Render a figure now and write it to disk on the background save pool.
+    
+    Figures are not thread-safe, so all drawing happens on the calling
+    thread. For raster formats the worker only encodes a copy of the Agg
+    pixel buffer (the compression step that dominates savefig); for SVG
+    the figure is serialized up front and the worker just writes the bytes.
+    
+    Args:
+        fig: Matplotlib Figure with an Agg canvas, fully laid out
+        chart_path: Destination file path
+        output_format: 'svg', 'png' or 'webp'
+        dpi: Resolution the figure was created with (raster formats)
+    
+    Returns:
+        concurrent.futures.Future: Resolves to chart_path once written
+    """
+    if output_format == 'svg':
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=output_format)
+        return _SAVE_POOL.submit(_write_bytes, chart_path, buffer.getvalue())
+    
+    # Copy the pixels, since the canvas buffer belongs to the figure
+    fig.canvas.draw()
+    rgba = np.array(fig.canvas.buffer_rgba())
+    return _SAVE_POOL.submit(_write_image, chart_path, rgba, output_format, dpi)
 
 
 def create_visualizations(prices, returns, portfolio_returns, output_dir="outputs", 
-                         show_rolling_volatility=True):
+                         show_rolling_volatility=True, dpi=100, max_points=2000,
+                         output_format="svg", legend_loc="upper left", async_save=False,
+                         max_vol_traces=5):
     """
     Create comprehensive visualization charts for portfolio analysis.
     
@@ -27,97 +238,152 @@ def create_visualizations(prices, returns, portfolio_returns, output_dir="output
         portfolio_returns: Series with portfolio daily returns
         output_dir: Directory to save charts (default: "outputs")
         show_rolling_volatility: Whether to include rolling volatility chart (default: True)
+        dpi: Resolution of raster charts (png, webp) in dots per inch (default: 100)
+        max_points: Most samples drawn per asset line, at least 3; longer
+                    histories are downsampled with LTTB, None draws every
+                    sample (default: 2000)
+        output_format: Chart file format, one of 'svg', 'png' or 'webp'
+                       (default: 'svg'). SVG keeps the lines as vectors and
+                       skips rasterizing and compressing the whole figure.
+        legend_loc: Legend position for every chart (default: 'upper left').
+                    A fixed position avoids the overlap search that 'best'
+                    runs against every drawn point on each save.
+        async_save: Whether to write the chart file on a background thread so
+                    the caller can continue with other work (default: False)
+        max_vol_traces: Most per-asset lines on the rolling volatility chart
+                        (default: 5). With more assets than this, only the
+                        ones with the highest daily return volatility are
+                        drawn, in their original order and colors, next to
+                        the portfolio line. None draws every asset.
+    
+    Returns:
+        concurrent.futures.Future or None: With async_save, a future that
+        resolves to the chart path once the file is written; call .result()
+        before relying on the file. None when saving synchronously.
+    
+    Raises:
+        ValueError: If max_points is less than 3
     """
     # Create output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
     
     # Determine number of subplots based on whether we show rolling volatility
     num_plots = 3 if show_rolling_volatility else 2
-    fig, axes = plt.subplots(num_plots, 1, figsize=(14, 5 * num_plots))
+    # Charts are only ever written to files, so draw on an Agg canvas
+    # directly instead of going through pyplot's global figure manager
+    fig = Figure(figsize=(14, 5 * num_plots), dpi=dpi)
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(num_plots, 1)
     
     # If only one subplot, make axes a list for consistent indexing
     if num_plots == 1:
         axes = [axes]
     
+    # Convert each date index to matplotlib date numbers once and plot raw
+    # floats, instead of letting matplotlib convert the index for every line
+    returns_x = mdates.date2num(portfolio_returns.index)
+    if returns.index.equals(portfolio_returns.index):
+        asset_returns_x = returns_x
+    else:
+        asset_returns_x = mdates.date2num(returns.index)
+    prices_x = mdates.date2num(prices.index)
+    
     # Chart 1: Portfolio Value Over Time (Normalized)
     ax1 = axes[0]
-    portfolio_value = (1 + portfolio_returns).cumprod()
-    ax1.plot(portfolio_value.index, portfolio_value.values, 
+    # Growth of $1 compounded in log space in float64: one cumulative sum
+    # over log(1 + r) on the ndarray instead of pandas' (1 + r).cumprod()
+    log_growth = np.log1p(portfolio_returns.to_numpy(dtype=np.float64))
+    portfolio_value = np.exp(np.cumsum(log_growth))
+    ax1.plot(returns_x, portfolio_value, 
              linewidth=2.5, label='Portfolio', color='#2E86AB', alpha=0.9)
     ax1.set_title('Portfolio Value Over Time (Normalized to $1)', 
                   fontsize=14, fontweight='bold', pad=15)
     ax1.set_xlabel('Date', fontsize=12)
     ax1.set_ylabel('Portfolio Value', fontsize=12)
-    ax1.grid(True, alpha=0.3, linestyle='--')
-    ax1.legend(loc='best', fontsize=11)
-    ax1.tick_params(axis='x', rotation=45)
-    
-    # Format x-axis dates nicely
-    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    ax1.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
+    ax1.legend(loc=legend_loc, fontsize=11)
+    _style_date_axis(ax1)
     
     # Chart 2: Individual Asset Performance (Normalized)
     ax2 = axes[1]
-    normalized_prices = prices / prices.iloc[0]  # Normalize to starting value of $1
+    # Normalize to starting value of $1 with one broadcast divide; a zero
+    # starting price is left unscaled instead of turning into inf
+    price_values = prices.to_numpy(dtype=float)
+    base = price_values[0]
+    normalized_prices = price_values / np.where(base == 0, 1.0, base)
     
-    # Use distinct colors for each asset
+    # Use distinct colors for each asset, assigned once so an asset keeps
+    # the same color on every chart
     colors = ['#A23B72', '#F18F01', '#C73E1D', '#6A994E', '#BC4749', '#219EBC']
+    asset_colors = [colors[i % len(colors)] for i in range(normalized_prices.shape[1])]
     
-    for idx, col in enumerate(normalized_prices.columns):
-        color = colors[idx % len(colors)]
-        ax2.plot(normalized_prices.index, normalized_prices[col].values, 
-                label=col, alpha=0.8, linewidth=2, color=color)
+    price_x, price_y = _downsample(prices_x, normalized_prices, max_points)
+    price_handles = _plot_line_collection(
+        ax2, price_x, price_y,
+        asset_colors, list(prices.columns), linewidth=2, alpha=0.8
+    )
     
     ax2.set_title('Individual Asset Performance (Normalized to $1)', 
                   fontsize=14, fontweight='bold', pad=15)
     ax2.set_xlabel('Date', fontsize=12)
     ax2.set_ylabel('Normalized Price', fontsize=12)
-    ax2.grid(True, alpha=0.3, linestyle='--')
-    ax2.legend(loc='best', fontsize=11, ncol=2)
-    ax2.tick_params(axis='x', rotation=45)
-    
-    # Format x-axis dates
-    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    ax2.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
+    ax2.legend(handles=price_handles, loc=legend_loc, fontsize=11, ncol=2)
+    _style_date_axis(ax2)
     
     # Chart 3: Rolling Volatility (Optional)
     if show_rolling_volatility:
         ax3 = axes[2]
         
         # Calculate rolling volatility for portfolio
-        from .metrics import calculate_rolling_volatility
-        portfolio_rolling_vol = calculate_rolling_volatility(portfolio_returns, window=30)
+        portfolio_rolling_vol = calculate_rolling_volatility(portfolio_returns, window=30).to_numpy()
         
-        ax3.plot(portfolio_rolling_vol.index, portfolio_rolling_vol.values * 100,
-                linewidth=2, label='Portfolio (30-day)', color='#2E86AB', alpha=0.9)
+        portfolio_line, = ax3.plot(returns_x, portfolio_rolling_vol * 100,
+                                   linewidth=2, label='Portfolio (30-day)', color='#2E86AB', alpha=0.9)
         
-        # Also show individual assets' rolling volatility
-        for idx, col in enumerate(returns.columns):
-            asset_rolling_vol = calculate_rolling_volatility(returns[col], window=30)
-            color = colors[idx % len(colors)]
-            ax3.plot(asset_rolling_vol.index, asset_rolling_vol.values * 100,
-                    label=f'{col} (30-day)', alpha=0.6, linewidth=1.5, color=color, linestyle='--')
+        # Limit the per-asset lines to the most volatile assets
+        vol_returns = returns
+        vol_colors = asset_colors
+        if max_vol_traces is not None and returns.shape[1] > max_vol_traces:
+            daily_std = returns.to_numpy().std(axis=0, ddof=1, dtype=np.float64)
+            keep = np.sort(np.argsort(-daily_std, kind='stable')[:max_vol_traces])
+            vol_returns = returns.iloc[:, keep]
+            vol_colors = [asset_colors[i] for i in keep]
+        
+        # Also show individual assets' rolling volatility, computed for all
+        # assets in one pass over the returns DataFrame; scale to percent on
+        # the ndarray rather than through a pandas DataFrame operation
+        vol_handles = []
+        if vol_returns.shape[1] > 0:
+            asset_rolling_vol = calculate_rolling_volatility(vol_returns, window=30).to_numpy() * 100
+            vol_x, vol_y = _downsample(asset_returns_x, asset_rolling_vol, max_points)
+            vol_handles = _plot_line_collection(
+                ax3, vol_x, vol_y,
+                vol_colors, [f'{col} (30-day)' for col in vol_returns.columns],
+                linewidth=1.5, alpha=0.6, linestyle='--'
+            )
         
         ax3.set_title('Rolling 30-Day Annualized Volatility', 
                       fontsize=14, fontweight='bold', pad=15)
         ax3.set_xlabel('Date', fontsize=12)
         ax3.set_ylabel('Volatility (%)', fontsize=12)
-        ax3.grid(True, alpha=0.3, linestyle='--')
-        ax3.legend(loc='best', fontsize=10, ncol=2)
-        ax3.tick_params(axis='x', rotation=45)
-        
-        # Format x-axis dates
-        ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-        ax3.xaxis.set_major_locator(mdates.MonthLocator(interval=2))
+        ax3.legend(handles=[portfolio_line] + vol_handles, loc=legend_loc, fontsize=10, ncol=2)
+        _style_date_axis(ax3)
     
     # Adjust layout to prevent overlap
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save chart
-    chart_path = os.path.join(output_dir, 'portfolio_analysis.png')
-    plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-    print(f"📊 Chart saved to: {chart_path}")
+    chart_path = os.path.join(output_dir, f'portfolio_analysis.{output_format}')
+    future = None
+    if async_save:
+        future = _submit_save(fig, chart_path, output_format, dpi)
+        print(f"📊 Saving chart in the background to: {chart_path}")
+    elif output_format == 'svg':
+        # Vector output has no resolution
+        fig.savefig(chart_path, format=output_format)
+        print(f"📊 Chart saved to: {chart_path}")
+    else:
+        fig.savefig(chart_path, format=output_format, dpi=dpi)
+        print(f"📊 Chart saved to: {chart_path}")
     
-    # Close figure to free memory
-    plt.close()
+    return future
 
@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import os
+import sys
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
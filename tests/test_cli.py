@@ -5,13 +5,9 @@ Tests argument validation and weight checking.
 """
 
 import unittest
-import sys
-import os
+import argparse
 from unittest.mock import patch
 
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from portfolio_analyzer.cli import validate_arguments
 from portfolio_analyzer.portfolio import validate_weights
 
@@ -44,6 +40,23 @@ class TestCLI(unittest.TestCase):
         """Test that negative weights are rejected."""
         with self.assertRaises(ValueError):
             validate_weights([-0.5, 0.5, 1.0], num_tickers=3)
+    
+    def test_parquet_without_pyarrow_exits_early(self):
+        """Test that --summary-format parquet fails validation when pyarrow is missing."""
+        args = argparse.Namespace(
+            tickers=['aapl'], weights=None, start_date=None, end_date=None,
+            risk_free_rate=0.03, output_dir='outputs', summary_format='parquet'
+        )
+        
+        with patch('portfolio_analyzer.cli.importlib.util.find_spec', return_value=None), \
+                patch('builtins.print'):
+            with self.assertRaises(SystemExit):
+                validate_arguments(args)
+        
+        # With pyarrow available the same arguments are accepted
+        with patch('portfolio_analyzer.cli.importlib.util.find_spec', return_value=object()):
+            validate_arguments(args)
+        self.assertEqual(args.tickers, ['AAPL'])
 
 
 if __name__ == '__main__':
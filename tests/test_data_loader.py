@@ -0,0 +1,114 @@
+"""
+Unit tests for data loading module.
+
+Tests the price cache around the batched Yahoo Finance download.
+"""
+
+import unittest
+import os
+import tempfile
+import time
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+from portfolio_analyzer import data_loader
+from portfolio_analyzer.data_loader import download_stock_data
+
+
+def fake_download(tickers, **kwargs):
+    """Stand-in for yf.download returning Close and Open columns per ticker."""
+    dates = pd.bdate_range('2020-01-01', periods=5)
+    columns = pd.MultiIndex.from_product([['Close', 'Open'], tickers])
+    values = np.arange(len(dates) * len(columns), dtype=float).reshape(len(dates), -1) + 1
+    return pd.DataFrame(values, index=dates, columns=columns)
+
+
+class TestDataLoaderCache(unittest.TestCase):
+    """Test cases for the on-disk and in-process price cache."""
+    
+    def setUp(self):
+        """Point the cache at an empty temporary directory and mock the download."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = os.path.join(tmp.name, 'cache')
+        
+        patchers = [
+            patch.object(data_loader, 'CACHE_DIR', self.cache_dir),
+            patch.dict(data_loader._PRICE_CACHE, clear=True),
+            patch('builtins.print'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        download_patcher = patch.object(data_loader.yf, 'download', side_effect=fake_download)
+        self.download = download_patcher.start()
+        self.addCleanup(download_patcher.stop)
+    
+    def age_cache_files(self, seconds):
+        """Make every cache file look seconds old and drop the in-process copies."""
+        old = time.time() - seconds
+        for filename in os.listdir(self.cache_dir):
+            os.utime(os.path.join(self.cache_dir, filename), (old, old))
+        data_loader._PRICE_CACHE.clear()
+    
+    def test_cache_hit_skips_download(self):
+        """Test that cached tickers are served from disk without downloading."""
+        first = download_stock_data(['AAPL', 'MSFT'], period='1y')
+        self.assertEqual(self.download.call_count, 1)
+        
+        # Drop the in-process copies so the second call reads the pickles
+        data_loader._PRICE_CACHE.clear()
+        second = download_stock_data(['AAPL', 'MSFT'], period='1y')
+        
+        self.assertEqual(self.download.call_count, 1)
+        pd.testing.assert_frame_equal(first, second)
+    
+    def test_partial_hit_downloads_only_missing(self):
+        """Test that only uncached tickers are downloaded, keeping column order."""
+        download_stock_data(['AAPL'], period='1y')
+        
+        prices = download_stock_data(['MSFT', 'AAPL', 'TSLA'], period='1y')
+        
+        self.assertEqual(self.download.call_count, 2)
+        self.assertEqual(self.download.call_args.args[0], ['MSFT', 'TSLA'])
+        self.assertEqual(list(prices.columns), ['MSFT', 'AAPL', 'TSLA'])
+    
+    def test_past_date_range_never_expires(self):
+        """Test that a cached range ending in the past is reused however old."""
+        download_stock_data(['AAPL'], start_date='2020-01-01', end_date='2020-06-30')
+        self.age_cache_files(10 * data_loader.CACHE_EXPIRY.total_seconds())
+        
+        download_stock_data(['AAPL'], start_date='2020-01-01', end_date='2020-06-30')
+        
+        self.assertEqual(self.download.call_count, 1)
+    
+    def test_expired_period_is_refetched(self):
+        """Test that a period request older than CACHE_EXPIRY is downloaded again."""
+        download_stock_data(['AAPL'], period='1y')
+        self.age_cache_files(data_loader.CACHE_EXPIRY.total_seconds() + 60)
+        
+        download_stock_data(['AAPL'], period='1y')
+        
+        self.assertEqual(self.download.call_count, 2)
+        self.assertEqual(self.download.call_args.args[0], ['AAPL'])
+    
+    def test_no_cache_neither_reads_nor_writes(self):
+        """Test that use_cache=False always downloads and leaves the cache untouched."""
+        download_stock_data(['AAPL'], period='1y', use_cache=False)
+        self.assertFalse(os.path.exists(self.cache_dir))
+        
+        download_stock_data(['AAPL'], period='1y')
+        cached_files = os.listdir(self.cache_dir)
+        
+        download_stock_data(['AAPL', 'MSFT'], period='1y', use_cache=False)
+        
+        self.assertEqual(self.download.call_count, 3)
+        self.assertEqual(self.download.call_args.args[0], ['AAPL', 'MSFT'])
+        self.assertEqual(os.listdir(self.cache_dir), cached_files)
+        self.assertNotIn(data_loader._cache_key('MSFT', None, None, '1y'), data_loader._PRICE_CACHE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,39 +5,72 @@ Tests Sharpe ratio calculation and other performance metrics.
 """
 
 import unittest
+from unittest.mock import patch
 import pandas as pd
 import numpy as np
-import sys
-import os
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from portfolio_analyzer import _kernels
 from portfolio_analyzer.metrics import (
+    calculate_returns,
     calculate_sharpe_ratio,
     calculate_annualized_return,
     calculate_annualized_volatility,
     calculate_cumulative_return,
-    calculate_maximum_drawdown
+    calculate_maximum_drawdown,
+    calculate_rolling_volatility,
+    calculate_asset_metrics,
+    calculate_all_asset_metrics
 )
 
 
 class TestMetrics(unittest.TestCase):
     """Test cases for metrics calculations."""
     
-    def setUp(self):
-        """Set up test data."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data shared by every test; no test modifies it."""
         # Create sample returns: 1% daily return for 10 days
-        self.positive_returns = pd.Series([0.01] * 10)
+        # Constant series stay float64: the Sharpe tests rely on their tiny
+        # nonzero float64 std, which is exactly zero in float32
+        cls.positive_returns = pd.Series([0.01] * 10)
         
         # Create sample returns: -1% daily return for 10 days
-        self.negative_returns = pd.Series([-0.01] * 10)
+        cls.negative_returns = pd.Series([-0.01] * 10)
         
-        # Create mixed returns (some positive, some negative)
-        self.mixed_returns = pd.Series([0.02, -0.01, 0.015, -0.005, 0.01])
+        # Create mixed returns (some positive, some negative), in the float32
+        # dtype calculate_returns produces
+        cls.mixed_returns = pd.Series([0.02, -0.01, 0.015, -0.005, 0.01], dtype=np.float32)
         
         # Create empty returns
-        self.empty_returns = pd.Series(dtype=float)
+        cls.empty_returns = pd.Series(dtype=float)
+    
+    def test_returns_calculation(self):
+        """Test daily returns calculation from prices."""
+        dates = pd.date_range('2023-01-01', periods=4, freq='D')
+        prices = pd.DataFrame({
+            'AAPL': [100.0, 110.0, 99.0, 99.0],
+            'MSFT': [50.0, 50.0, 55.0, 44.0]
+        }, index=dates)
+        returns = calculate_returns(prices)
+        
+        # First day has no previous price, so it is dropped
+        self.assertEqual(list(returns.index), list(dates[1:]))
+        self.assertEqual(list(returns.columns), ['AAPL', 'MSFT'])
+        self.assertTrue((returns.dtypes == np.float32).all())
+        np.testing.assert_array_almost_equal(returns['AAPL'], [0.10, -0.10, 0.0])
+        np.testing.assert_array_almost_equal(returns['MSFT'], [0.0, 0.10, -0.20])
+    
+    def test_returns_calculation_missing_prices(self):
+        """Test that days touching a missing price are dropped."""
+        dates = pd.date_range('2023-01-01', periods=4, freq='D')
+        prices = pd.DataFrame({
+            'AAPL': [100.0, np.nan, 99.0, 108.9],
+            'MSFT': [50.0, 55.0, 55.0, 44.0]
+        }, index=dates)
+        returns = calculate_returns(prices)
+        
+        self.assertEqual(list(returns.index), [dates[3]])
+        np.testing.assert_array_almost_equal(returns.iloc[0], [0.10, -0.20])
     
     def test_sharpe_ratio_positive_returns(self):
         """Test Sharpe ratio calculation with positive returns."""
@@ -94,6 +127,73 @@ class TestMetrics(unittest.TestCase):
         
         # Maximum drawdown should be negative (or zero)
         self.assertLessEqual(max_dd, 0, "Maximum drawdown should be negative or zero")
+        
+        # Peak of 1.05 * 1.03 followed by two losing days
+        expected = (1.05 * 1.03 * 0.90 * 0.95) / (1.05 * 1.03) - 1
+        self.assertAlmostEqual(max_dd, expected, places=10)
+        
+        # A missing day is skipped rather than ending the cumulative growth
+        with_gap = calculate_maximum_drawdown(pd.Series([0.05, np.nan, -0.10, 0.02]))
+        self.assertAlmostEqual(with_gap, -0.10, places=10)
+    
+    def test_maximum_drawdown_no_decline(self):
+        """Test that steadily rising prices have zero drawdown."""
+        self.assertEqual(calculate_maximum_drawdown(self.positive_returns), 0.0)
+    
+    def test_maximum_drawdown_without_numba(self):
+        """Test the NumPy drawdown fallback used when numba is not installed."""
+        returns_with_drawdown = pd.Series([0.05, 0.03, -0.10, -0.05, 0.02])
+        returns_with_gap = pd.Series([0.05, np.nan, -0.10, 0.02])
+        expected = (1.05 * 1.03 * 0.90 * 0.95) / (1.05 * 1.03) - 1
+        
+        with patch.object(_kernels, 'max_drawdown', None):
+            max_dd = calculate_maximum_drawdown(returns_with_drawdown)
+            no_decline = calculate_maximum_drawdown(self.positive_returns)
+            asset_dd = calculate_asset_metrics(returns_with_drawdown, 'DD')['Maximum Drawdown (%)']
+            fallback_gap = calculate_maximum_drawdown(returns_with_gap)
+        
+        self.assertIsInstance(max_dd, float)
+        self.assertAlmostEqual(max_dd, expected, places=10)
+        self.assertEqual(no_decline, 0.0)
+        self.assertAlmostEqual(asset_dd, expected * 100, places=8)
+        
+        # Both paths skip the missing day
+        self.assertAlmostEqual(fallback_gap, -0.10, places=10)
+        self.assertAlmostEqual(fallback_gap, calculate_maximum_drawdown(returns_with_gap), places=10)
+    
+    def test_rolling_volatility_matches_pandas(self):
+        """Test rolling volatility against pandas' rolling std, including gaps."""
+        rng = np.random.default_rng(0)
+        returns = pd.DataFrame(rng.normal(0, 0.02, size=(80, 2)), columns=['A', 'B'])
+        returns.iloc[40, 1] = np.nan
+        returns.iloc[20, 0] = np.inf
+        
+        rolling_vol = calculate_rolling_volatility(returns, window=10)
+        expected = returns.rolling(window=10).std() * np.sqrt(252)
+        pd.testing.assert_frame_equal(rolling_vol, expected, check_exact=False, rtol=1e-9)
+        
+        series_vol = calculate_rolling_volatility(returns['A'], window=10)
+        pd.testing.assert_series_equal(series_vol, expected['A'], check_exact=False, rtol=1e-9)
+    
+    def test_rolling_volatility_without_numba(self):
+        """Test the pandas rolling volatility fallback used when numba is not installed."""
+        rng = np.random.default_rng(0)
+        returns = pd.DataFrame(rng.normal(0, 0.02, size=(80, 2)), columns=['A', 'B'])
+        returns.iloc[40, 1] = np.nan
+        
+        with patch.object(_kernels, 'rolling_std', None):
+            rolling_vol = calculate_rolling_volatility(returns, window=10)
+            series_vol = calculate_rolling_volatility(returns['A'], window=10)
+        
+        # Expected values straight from the std of each trailing window
+        values = returns.to_numpy()
+        expected = np.full(values.shape, np.nan)
+        for i in range(9, len(values)):
+            expected[i] = values[i - 9:i + 1].std(axis=0, ddof=1) * np.sqrt(252)
+        
+        np.testing.assert_allclose(rolling_vol.to_numpy(), expected, rtol=1e-9)
+        np.testing.assert_allclose(series_vol.to_numpy(), expected[:, 0], rtol=1e-9)
+        self.assertEqual(list(rolling_vol.columns), ['A', 'B'])
     
     def test_empty_returns(self):
         """Test that functions handle empty returns gracefully."""
@@ -102,6 +202,29 @@ class TestMetrics(unittest.TestCase):
         cumulative = calculate_cumulative_return(self.empty_returns)
         self.assertIsInstance(cumulative, (float, type(pd.Series(dtype=float).prod())))
 
+    
+    def test_all_asset_metrics_match_single_asset(self):
+        """Test that vectorized metrics match per-asset calculation."""
+        returns = pd.DataFrame({
+            'UP': [0.01, 0.02, 0.005, 0.01, 0.015],
+            'MIXED': self.mixed_returns.values,
+            'DRAWDOWN': [0.05, 0.03, -0.10, -0.05, 0.02]
+        }, dtype=np.float32)
+        all_metrics = calculate_all_asset_metrics(returns, risk_free_rate=0.03)
+        
+        self.assertEqual(list(all_metrics.index), ['UP', 'MIXED', 'DRAWDOWN'])
+        for ticker in returns.columns:
+            expected = calculate_asset_metrics(returns[ticker], ticker, risk_free_rate=0.03)
+            for key, value in expected.items():
+                if key == 'Ticker':
+                    continue
+                self.assertAlmostEqual(all_metrics.loc[ticker, key], value, places=6, msg=f"{ticker} {key}")
+    
+    def test_all_asset_metrics_empty_returns(self):
+        """Test that vectorized metrics return an empty table for empty returns."""
+        all_metrics = calculate_all_asset_metrics(pd.DataFrame({'AAPL': pd.Series(dtype=float)}))
+        self.assertTrue(all_metrics.empty)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -7,31 +7,28 @@ Tests portfolio return calculation and weight validation.
 import unittest
 import pandas as pd
 import numpy as np
-import sys
-import os
-
-# Add parent directory to path to import modules
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from portfolio_analyzer.portfolio import (
     calculate_portfolio_returns,
     validate_weights,
     calculate_portfolio_metrics
 )
+from portfolio_analyzer.metrics import calculate_asset_metrics
 
 
 class TestPortfolio(unittest.TestCase):
     """Test cases for portfolio calculations."""
     
-    def setUp(self):
-        """Set up test data."""
+    @classmethod
+    def setUpClass(cls):
+        """Set up test data shared by every test; no test modifies it."""
         # Create sample returns DataFrame with 3 assets
         dates = pd.date_range('2023-01-01', periods=5, freq='D')
-        self.returns = pd.DataFrame({
+        cls.returns = pd.DataFrame({
             'AAPL': [0.01, 0.02, -0.01, 0.015, 0.01],
             'MSFT': [0.015, 0.01, 0.02, -0.005, 0.02],
             'GOOGL': [0.02, -0.01, 0.01, 0.02, 0.015]
-        }, index=dates)
+        }, index=dates, dtype=np.float32)
     
     def test_portfolio_returns_equal_weights(self):
         """Test portfolio returns calculation with equal weights."""
@@ -97,6 +94,14 @@ class TestPortfolio(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_weights([0.0, 0.0, 0.0], num_tickers=3)
     
+    def test_validate_weights_repeated_calls(self):
+        """Test that modifying returned weights does not affect later calls."""
+        first = validate_weights([0.4, 0.3, 0.3], num_tickers=3)
+        first[0] = 10.0
+        
+        second = validate_weights([0.4, 0.3, 0.3], num_tickers=3)
+        np.testing.assert_array_almost_equal(second, [0.4, 0.3, 0.3])
+    
     def test_portfolio_metrics_calculation(self):
         """Test portfolio metrics calculation."""
         weights = [0.4, 0.3, 0.3]
@@ -111,6 +116,20 @@ class TestPortfolio(unittest.TestCase):
         
         # Weights should match input (normalized)
         self.assertEqual(len(metrics['Weights']), 3)
+    
+    def test_portfolio_metrics_match_single_asset(self):
+        """Test that a one-asset portfolio reports exactly its asset's metrics."""
+        rng = np.random.default_rng(0)
+        returns = pd.DataFrame({'AAPL': rng.normal(0.002, 0.02, 6000)}, dtype=np.float32)
+        
+        portfolio = calculate_portfolio_metrics(returns, risk_free_rate=0.03)
+        asset = calculate_asset_metrics(returns['AAPL'], 'AAPL', risk_free_rate=0.03)
+        
+        for key in ['Cumulative Return (%)', 'Annualized Return (%)', 'Annualized Volatility (%)',
+                    'Sharpe Ratio', 'Maximum Drawdown (%)']:
+            value = portfolio[f'Portfolio {key}']
+            self.assertIsInstance(value, float, key)
+            self.assertEqual(value, asset[key], key)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,169 @@
+"""
+Unit tests for visualization module.
+
+Tests the LTTB downsampling used for long per-asset traces and the
+chart files written by create_visualizations.
+"""
+
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+from portfolio_analyzer import visualization
+from portfolio_analyzer.metrics import calculate_returns
+from portfolio_analyzer.visualization import _lttb_indices, _downsample, create_visualizations
+
+
+def reference_lttb(x, y, num_points):
+    """Straightforward scalar LTTB over one column, for comparison."""
+    num_rows = len(x)
+    edges = np.linspace(1, num_rows - 1, num_points - 1).astype(int)
+    selected = [0]
+    previous = 0
+    for i in range(num_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 1 < num_points - 2:
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+            avg_x = x[next_start:next_stop].mean()
+            avg_y = y[next_start:next_stop].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        
+        best_area = -1.0
+        best = start
+        for candidate in range(start, stop):
+            area = abs((x[previous] - avg_x) * (y[candidate] - y[previous])
+                       - (x[previous] - x[candidate]) * (avg_y - y[previous]))
+            if area > best_area:
+                best_area = area
+                best = candidate
+        selected.append(best)
+        previous = best
+    selected.append(num_rows - 1)
+    return np.array(selected)
+
+
+class TestDownsampling(unittest.TestCase):
+    """Test cases for LTTB downsampling."""
+    
+    def test_lttb_matches_scalar_reference(self):
+        """Test the vectorized LTTB against the scalar reference on random data."""
+        rng = np.random.default_rng(0)
+        for case in range(300):
+            num_rows = int(rng.integers(10, 400))
+            num_points = int(rng.integers(3, num_rows))
+            num_cols = int(rng.integers(1, 4))
+            x = np.sort(rng.uniform(0, 1000, num_rows))
+            values = rng.normal(size=(num_rows, num_cols)).cumsum(axis=0)
+            
+            indices = _lttb_indices(x, values, num_points)
+            
+            self.assertEqual(indices.shape, (num_points, num_cols))
+            for col in range(num_cols):
+                expected = reference_lttb(x, values[:, col], num_points)
+                np.testing.assert_array_equal(indices[:, col], expected, err_msg=f"case {case} column {col}")
+    
+    def test_lttb_keeps_endpoints_in_order(self):
+        """Test that endpoints are kept and indices increase, with a NaN warm-up."""
+        rng = np.random.default_rng(1)
+        x = np.arange(1000, dtype=float)
+        values = rng.normal(size=(1000, 3)).cumsum(axis=0)
+        values[:29, 1] = np.nan
+        
+        indices = _lttb_indices(x, values, 100)
+        
+        np.testing.assert_array_equal(indices[0], [0, 0, 0])
+        np.testing.assert_array_equal(indices[-1], [999, 999, 999])
+        self.assertTrue((np.diff(indices, axis=0) > 0).all())
+        
+        # NaN samples are only picked where a whole bucket is NaN: the first
+        # sample and the buckets covering rows 1-10 and 11-20
+        nan_picked = np.isnan(values[indices[:, 1], 1]).sum()
+        self.assertEqual(nan_picked, 3)
+        self.assertFalse(np.isnan(values[indices[:, 0], 0]).any())
+    
+    def test_downsample_short_series_unchanged(self):
+        """Test that series within max_points, or max_points=None, pass through."""
+        x = np.arange(50, dtype=float)
+        values = np.ones((50, 2))
+        
+        self.assertIs(_downsample(x, values, 100)[1], values)
+        self.assertIs(_downsample(x, values, None)[1], values)
+        
+        down_x, down_y = _downsample(x, values, 10)
+        self.assertEqual(down_x.shape, (10, 2))
+        self.assertEqual(down_y.shape, (10, 2))
+    
+    def test_downsample_rejects_too_few_points(self):
+        """Test that max_points below 3 raises instead of dropping samples."""
+        x = np.arange(50, dtype=float)
+        values = np.ones((50, 2))
+        
+        for max_points in (0, 1, 2):
+            with self.assertRaises(ValueError):
+                _downsample(x, values, max_points)
+        
+        self.assertEqual(_downsample(x, values, 3)[1].shape, (3, 2))
+
+
+
+class TestCreateVisualizations(unittest.TestCase):
+    """Smoke tests for the chart file written by create_visualizations."""
+    
+    def setUp(self):
+        """Build eight assets whose volatility grows with their column index."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.output_dir = tmp.name
+        
+        print_patcher = patch('builtins.print')
+        print_patcher.start()
+        self.addCleanup(print_patcher.stop)
+        
+        rng = np.random.default_rng(0)
+        dates = pd.bdate_range('2023-01-02', periods=100)
+        scales = np.linspace(0.005, 0.04, 8)
+        daily = 1 + rng.normal(0.0005, 1.0, size=(100, 8)) * scales
+        self.prices = pd.DataFrame(100 * daily.cumprod(axis=0), index=dates,
+                                   columns=[f'T{i}' for i in range(8)])
+        self.returns = calculate_returns(self.prices)
+        self.portfolio_returns = self.returns.mean(axis=1)
+    
+    def test_writes_each_format(self):
+        """Test that every output format writes its chart file."""
+        for output_format in ('svg', 'png', 'webp'):
+            future = create_visualizations(self.prices, self.returns, self.portfolio_returns,
+                                           output_dir=self.output_dir, output_format=output_format)
+            
+            self.assertIsNone(future)
+            path = os.path.join(self.output_dir, f'portfolio_analysis.{output_format}')
+            self.assertGreater(os.path.getsize(path), 0)
+    
+    def test_async_save_future_resolves_to_path(self):
+        """Test that async_save returns a future resolving to the written file."""
+        future = create_visualizations(self.prices, self.returns, self.portfolio_returns,
+                                       output_dir=self.output_dir, output_format='png',
+                                       async_save=True)
+        
+        path = future.result(timeout=60)
+        self.assertEqual(path, os.path.join(self.output_dir, 'portfolio_analysis.png'))
+        self.assertGreater(os.path.getsize(path), 0)
+    
+    def test_volatility_chart_keeps_most_volatile_assets(self):
+        """Test that only max_vol_traces asset lines are drawn on the volatility chart."""
+        with patch.object(visualization, '_plot_line_collection',
+                          wraps=visualization._plot_line_collection) as plot_lines:
+            create_visualizations(self.prices, self.returns, self.portfolio_returns,
+                                  output_dir=self.output_dir, max_vol_traces=3)
+        
+        # One call for the price chart, one for the volatility chart
+        price_call, vol_call = plot_lines.call_args_list
+        self.assertEqual(len(price_call.args[4]), 8)
+        self.assertEqual(vol_call.args[4], ['T5 (30-day)', 'T6 (30-day)', 'T7 (30-day)'])
+
+
+if __name__ == '__main__':
+    unittest.main()